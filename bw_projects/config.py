@@ -1,6 +1,6 @@
 """Configurations for bw_projects."""
 from pathlib import Path
-from typing import Final, List
+from typing import Dict, Final, List, Union
 
 import platformdirs
 
@@ -14,6 +14,13 @@ class Configuration:
         "lci",
         "processed",
     ]
+    SQLITE_PRAGMAS: Final[Dict[str, Union[int, str]]] = {
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "cache_size": -8000,
+        "temp_store": "memory",
+        "mmap_size": 268435456,
+    }
 
     def __init__(
         self,
@@ -21,11 +28,15 @@ class Configuration:
         app_author: str = "pycla",
         dirs_basic: List[str] = None,
         dir_output: Path = Path.home(),
+        sqlite_pragmas: Dict[str, Union[int, str]] = None,
     ) -> None:
         if dirs_basic is None:
             dirs_basic = self.DIRS_BASIC
+        if sqlite_pragmas is None:
+            sqlite_pragmas = self.SQLITE_PRAGMAS
 
         self.dir_base_data = Path(platformdirs.user_data_dir(app_name, app_author))
         self.dir_base_logs = Path(platformdirs.user_log_dir(app_name, app_author))
         self.dir_output = dir_output
         self.dirs_basic = dirs_basic
+        self.sqlite_pragmas = sqlite_pragmas
@@ -1,8 +1,8 @@
 """Core functionalities for bw_projects."""
 import os
-from collections.abc import Iterable
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Dict, List, NoReturn
+from typing import Callable, Dict, Iterator, List, NoReturn
 
 from peewee import DoesNotExist
 from slugify import slugify
@@ -13,7 +13,19 @@ from .helpers import DatabaseHelper, FileHelper
 from .model import Project
 
 
-class ProjectsManager(Iterable):
+@lru_cache(maxsize=1024)
+def _clean_directory_name(name: str) -> str:
+    """Returns the memoized slug of the given project name."""
+    return slugify(name)
+
+
+@lru_cache(maxsize=1)
+def _default_configuration() -> Configuration:
+    """Returns the default configuration, built on first use."""
+    return Configuration()
+
+
+class ProjectsManager:
     """Manages projects."""
 
     def __init__(
@@ -23,7 +35,7 @@ class ProjectsManager(Iterable):
         database_name: str = "projects.db",
         output_dir_name: str = None,
         max_repr_len: int = 25,
-        config: Configuration = Configuration(),
+        config: Configuration = None,
         callbacks_activate_project: List[
             Callable[["ProjectsManager", str, Dict[str, str], str], NoReturn]
         ] = None,
@@ -37,6 +49,8 @@ class ProjectsManager(Iterable):
             Callable[["ProjectsManager", str, Dict[str, str], str], NoReturn]
         ] = None,
     ) -> None:
+        if config is None:
+            config = _default_configuration()
         if callbacks_activate_project is None:
             callbacks_activate_project = []
         if callbacks_create_project is None:
@@ -55,11 +69,14 @@ class ProjectsManager(Iterable):
         self.callbacks_delete_project = callbacks_delete_project
         self.callbacks_copy_project = callbacks_copy_project
         self._active_project: Project = None
-        DatabaseHelper.init_db(self.file_helper.dir_base_data / database_name)
+        self._data_dir: Path = None
+        self._logs_dir: Path = None
+        DatabaseHelper.init_db(
+            self.file_helper.dir_base_data / database_name, config.sqlite_pragmas
+        )
 
-    def __iter__(self):
-        for project in DatabaseHelper.get_projects():
-            yield project
+    def __iter__(self) -> Iterator[Project]:
+        yield from DatabaseHelper.get_projects(iterator=True)
 
     def __contains__(self, name: str) -> bool:
         return DatabaseHelper.project_exists(name)
@@ -68,31 +85,37 @@ class ProjectsManager(Iterable):
         return DatabaseHelper.get_projects_count()
 
     def __repr__(self) -> str:
-        projects = sorted([project.name for project in self])[: self.max_repr_len]
+        projects_count = len(self)
+        projects = DatabaseHelper.get_project_names(self.max_repr_len)
         projects_fmt = "".join([f"\n\t{project}" for project in projects])
         repr_str = (
-            f"bw_projects manager with {len(self)} projects, including:{projects_fmt}"
+            f"bw_projects manager with {projects_count} projects, "
+            f"including:{projects_fmt}"
         )
-        if len(self) > self.max_repr_len:
+        if projects_count > self.max_repr_len:
             repr_str += (
                 "\n\t...\nTo get full list of projects, use `list(ProjectsManager)`."
             )
         return repr_str
 
+    def iter_names(self) -> Iterator[str]:
+        """Yields the names of all projects without loading their attributes."""
+        return DatabaseHelper.iter_project_names()
+
     @staticmethod
     def get_clean_directory_name(name: str) -> str:
         """Changes project name to a file-friendly name."""
-        return slugify(name)
+        return _clean_directory_name(name)
 
     @property
     def data_dir(self) -> str:
         """Returns the data directory for active project."""
-        return self.file_helper.dir_base_data / self.active_project.name
+        return self._data_dir
 
     @property
     def logs_dir(self) -> str:
         """Returns the logs directory for active project."""
-        return self.file_helper.dir_base_logs / self.active_project.name
+        return self._logs_dir
 
     @property
     def output_dir(self) -> str:
@@ -108,13 +131,11 @@ class ProjectsManager(Iterable):
         """Activates the project with the given name."""
         project_name = ProjectsManager.get_clean_directory_name(name)
         self._active_project = DatabaseHelper.get_project(project_name)
-        for callback in self.callbacks_activate_project:
-            callback(
-                self,
-                project_name,
-                self._active_project.attributes,
-                self._active_project.dir_data,
-            )
+        self._data_dir = self.file_helper.get_project_data_directory(project_name)
+        self._logs_dir = self.file_helper.get_project_logs_directory(project_name)
+        self._run_callbacks(
+            self.callbacks_activate_project, project_name, self._active_project
+        )
 
     def create_project(
         self,
@@ -128,22 +149,21 @@ class ProjectsManager(Iterable):
             attributes = {}
 
         project_name = ProjectsManager.get_clean_directory_name(name)
-        if not DatabaseHelper.project_exists(project_name):
-            data_path, logs_path = self.file_helper.create_project_directory(
-                project_name, exist_ok
-            )
-            project = DatabaseHelper.create_project(
-                project_name, data_path, logs_path, attributes
-            )
-        else:
-            if not exist_ok:
+        with DatabaseHelper.atomic():
+            project = DatabaseHelper.get_project_or_none(project_name)
+            if project is None:
+                data_path, logs_path = self.file_helper.create_project_directory(
+                    project_name, exist_ok
+                )
+                project = DatabaseHelper.create_project(
+                    project_name, data_path, logs_path, attributes
+                )
+            elif not exist_ok:
                 raise ProjectExistsError(project_name)
-            project = DatabaseHelper.get_project(project_name)
 
         if activate:
             self.activate_project(project_name)
-        for callback in self.callbacks_create_project:
-            callback(self, project_name, project.attributes, project.dir_data)
+        self._run_callbacks(self.callbacks_create_project, project_name, project)
         return project
 
     def delete_project(
@@ -151,42 +171,69 @@ class ProjectsManager(Iterable):
     ) -> None:
         """Deletes the project with the given name."""
         project_name = ProjectsManager.get_clean_directory_name(name)
-        if not DatabaseHelper.project_exists(project_name):
+        project = DatabaseHelper.get_project_or_none(project_name)
+        if project is None:
             if not not_exist_ok:
                 raise DoesNotExist
             return
-        project = DatabaseHelper.get_project(project_name)
-        DatabaseHelper.delete_project(project_name)
-        if delete_dir:
-            self.file_helper.delete_project_directory(project_name)
-        if self._active_project.name == project_name:
+        with DatabaseHelper.atomic():
+            DatabaseHelper.delete_project(project_name)
+            if delete_dir:
+                self.file_helper.delete_project_directory(project_name)
+        active_project = self._active_project
+        if active_project is not None and active_project.name == project_name:
             self._active_project = None
-        for callback in self.callbacks_delete_project:
-            callback(self, project_name, project.attributes, project.dir_data)
+            self._data_dir = None
+            self._logs_dir = None
+        self._run_callbacks(self.callbacks_delete_project, project_name, project)
 
     def copy_project(
-        self, new_name: str, dirs_exist_ok: bool = False, switch: bool = True
+        self,
+        new_name: str,
+        dirs_exist_ok: bool = False,
+        switch: bool = True,
+        hardlink: bool = False,
     ) -> Project:
         """Copy current project to a new project named ``new_name``.
-        If ``switch``, switches to new project. Defaults to ``True``."""
+        If ``switch``, switches to new project. Defaults to ``True``.
+        If ``hardlink``, files are shared with the current project through hard
+        links instead of being copied. Defaults to ``False``.
+        Hard linked files are the same files in both projects, so writing to
+        them in place, as SQLite does with databases under ``lci``, changes
+        both projects."""
 
         project_name = ProjectsManager.get_clean_directory_name(new_name)
         if project_name in self:
             raise ProjectExistsError(project_name)
 
-        data_path, logs_path = self.file_helper.copy_project_directory(
-            self.active_project.name, project_name, dirs_exist_ok
-        )
-        project = DatabaseHelper.copy_project(
-            self.active_project.name, project_name, data_path, logs_path
-        )
+        with DatabaseHelper.atomic():
+            data_path, logs_path = self.file_helper.copy_project_directory(
+                self.active_project.name, project_name, dirs_exist_ok, hardlink
+            )
+            project = DatabaseHelper.copy_project(
+                self.active_project.name, project_name, data_path, logs_path
+            )
         if switch:
             self.activate_project(project_name)
 
-        for callback in self.callbacks_copy_project:
-            callback(self, project_name, project.attributes, project.dir_data)
+        self._run_callbacks(self.callbacks_copy_project, project_name, project)
         return project
 
+    def _run_callbacks(
+        self,
+        callbacks: List[
+            Callable[["ProjectsManager", str, Dict[str, str], str], NoReturn]
+        ],
+        project_name: str,
+        project: Project,
+    ) -> None:
+        """Calls ``callbacks`` for ``project``, reading its fields only once."""
+        if not callbacks:
+            return
+        attributes, dir_data = project.attributes, project.dir_data
+        for callback in callbacks:
+            callback(self, project_name, attributes, dir_data)
+
     def request_directory(self, dirname: str) -> Path:
         """Return the clean absolute path to the subdirectory ``dirname``,
         creating it if necessary."""
@@ -1,7 +1,7 @@
 """Exceptions for bw_projects."""
 
 
-class BWProjectsException(BaseException):
+class BWProjectsException(Exception):
     """Base class for exceptions in Brightway."""
 
 
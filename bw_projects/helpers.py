@@ -1,21 +1,109 @@
 """Helper classes for bw_projects."""
+import errno
+import os
 import shutil
+import stat
+import sys
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import ContextManager, Dict, Iterable, List, Optional, Tuple, Union
+
+from peewee import SQL
 
 from .config import Configuration
 from .model import SQLITE_DATABASE, Project
 
+# Cloning uses a Linux ioctl; other platforms keep the regular copy.
+if sys.platform.startswith("linux"):
+    import fcntl
+else:  # pragma: no cover
+    fcntl = None
+
+# Linux ioctl request for cloning a file; only exposed by ``fcntl`` from 3.12.
+FICLONE = getattr(fcntl, "FICLONE", 0x40049409)
+
+
+# Errors from the clone ioctl meaning the filesystem cannot clone ``src``.
+_CLONE_UNSUPPORTED_ERRORS = frozenset(
+    {errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY}
+)
+
+
+class _FileCloner:
+    """Copies files as copy-on-write clones where the filesystem supports it,
+    falling back to a regular copy otherwise.
+    Meant for a single ``shutil.copytree`` call, so an unsupported filesystem
+    is only probed once per tree."""
+
+    def __init__(self) -> None:
+        self.clone_supported = fcntl is not None
+
+    def __call__(self, src: str, dst: str) -> str:
+        # Only regular files are cloned: opening a FIFO for reading would block.
+        if self.clone_supported and stat.S_ISREG(os.stat(src).st_mode):
+            try:
+                dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            except FileExistsError:
+                # Never truncate an existing ``dst``: it may be ``src`` itself.
+                return shutil.copy2(src, dst)
+            try:
+                with open(src, "rb") as src_file:
+                    fcntl.ioctl(dst_fd, FICLONE, src_file.fileno())
+            except OSError as error:
+                os.close(dst_fd)
+                os.unlink(dst)
+                if error.errno not in _CLONE_UNSUPPORTED_ERRORS:
+                    raise
+                self.clone_supported = False
+            else:
+                os.close(dst_fd)
+                shutil.copystat(src, dst)
+                return dst
+        return shutil.copy2(src, dst)
+
+
+# Errors from ``os.link`` meaning ``src`` cannot be hard linked to ``dst``.
+_LINK_UNSUPPORTED_ERRORS = frozenset(
+    {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP}
+)
+
+
+class _FileLinker(_FileCloner):
+    """Hard links files, replacing an existing ``dst``, and falls back to
+    cloning or copying them where linking is not possible, e.g. across devices."""
+
+    def __call__(self, src: str, dst: str) -> str:
+        try:
+            os.link(src, dst)
+        except FileExistsError:
+            os.unlink(dst)
+            return self(src, dst)
+        except OSError as error:
+            if error.errno not in _LINK_UNSUPPORTED_ERRORS:
+                raise
+            return super().__call__(src, dst)
+        return dst
+
 
 class DatabaseHelper:
     """Helper class for database operations."""
 
+    # Compiled once from the model; only the name and limit are bound per call.
+    _PROJECT_EXISTS_SQL: str = (
+        Project.select(SQL("1")).where(Project.name == "").limit(1).sql()[0]
+    )
+
     @staticmethod
-    def init_db(database_name: str) -> None:
+    def init_db(database_name: str, pragmas: Dict[str, Union[int, str]] = None) -> None:
         """Initializes the database."""
-        SQLITE_DATABASE.init(database_name)
+        SQLITE_DATABASE.init(database_name, pragmas=pragmas)
+        SQLITE_DATABASE.connect(reuse_if_open=True)
         SQLITE_DATABASE.create_tables([Project])
 
+    @staticmethod
+    def atomic() -> ContextManager:
+        """Returns a context manager running its block in a single transaction."""
+        return SQLITE_DATABASE.atomic()
+
     @staticmethod
     def create_project(
         name: str, data_path: str, logs_path: str, attributes: Dict
@@ -35,12 +123,14 @@ class DatabaseHelper:
         name: str, new_name: str, data_path: str, logs_path: str
     ) -> Project:
         """Copies the project with the given name."""
-        project = Project.get(Project.name == name)
+        attributes = (
+            Project.select(Project.attributes).where(Project.name == name).scalar()
+        )
         return Project.create(
             name=new_name,
             dir_data=data_path,
             dir_logs=logs_path,
-            attributes=project.attributes,
+            attributes=attributes,
         )
 
     @staticmethod
@@ -49,9 +139,29 @@ class DatabaseHelper:
         return Project.get(Project.name == name)
 
     @staticmethod
-    def get_projects() -> list[Project]:
-        """Returns a list of all projects."""
-        return Project.select()
+    def get_project_or_none(name: str) -> Optional[Project]:
+        """Returns the project with the given name, or ``None`` if missing."""
+        return Project.get_or_none(Project.name == name)
+
+    @staticmethod
+    def get_projects(iterator: bool = False) -> Iterable[Project]:
+        """Returns all projects, streamed without caching rows if ``iterator``."""
+        query = Project.select()
+        return query.iterator() if iterator else query
+
+    @staticmethod
+    def iter_project_names() -> Iterable[str]:
+        """Yields the names of all projects."""
+        for (name,) in Project.select(Project.name).tuples().iterator():
+            yield name
+
+    @staticmethod
+    def get_project_names(limit: int = None) -> List[str]:
+        """Returns the sorted names of projects, at most ``limit`` if given."""
+        query = Project.select(Project.name).order_by(Project.name)
+        if limit is not None:
+            query = query.limit(limit)
+        return [name for (name,) in query.tuples()]
 
     @staticmethod
     def get_projects_count() -> int:
@@ -61,7 +171,10 @@ class DatabaseHelper:
     @staticmethod
     def project_exists(name: str) -> bool:
         """Checks if a project with the given name exists."""
-        return Project.select().where(Project.name == name).count() > 0
+        cursor = SQLITE_DATABASE.execute_sql(
+            DatabaseHelper._PROJECT_EXISTS_SQL, (name, 1)
+        )
+        return cursor.fetchone() is not None
 
 
 class FileHelper:
@@ -89,7 +202,7 @@ class FileHelper:
         else:
             self.dir_output = Path(output_dir_name)
 
-        self.dirs_basic = config.dirs_basic
+        self.dirs_basic: Tuple[str, ...] = tuple(config.dirs_basic)
 
         self.dir_base_data.mkdir(parents=True, exist_ok=True)
         self.dir_base_logs.mkdir(parents=True, exist_ok=True)
@@ -109,7 +222,7 @@ class FileHelper:
         project_data_dir.mkdir(parents=True, exist_ok=exist_ok)
         for dir_basic in self.dirs_basic:
             full_dir_basic = project_data_dir / dir_basic
-            full_dir_basic.mkdir(parents=True, exist_ok=exist_ok)
+            full_dir_basic.mkdir(exist_ok=exist_ok)
 
         project_logs_dir = self.get_project_logs_directory(name)
         project_logs_dir.mkdir(parents=True, exist_ok=exist_ok)
@@ -117,24 +230,37 @@ class FileHelper:
         return project_data_dir, project_logs_dir
 
     def delete_project_directory(self, name: str) -> None:
-        """Deletes the directory for the given project."""
-        shutil.rmtree(self.get_project_data_directory(name))
-        shutil.rmtree(self.get_project_logs_directory(name))
+        """Deletes the directory for the given project.
+        Nothing is deleted unless both the data and logs directories exist."""
+        project_dirs = (
+            self.get_project_data_directory(name),
+            self.get_project_logs_directory(name),
+        )
+        for project_dir in project_dirs:
+            if not project_dir.is_dir():
+                raise FileNotFoundError(
+                    errno.ENOENT, os.strerror(errno.ENOENT), str(project_dir)
+                )
+        for project_dir in project_dirs:
+            shutil.rmtree(project_dir)
 
     def copy_project_directory(
-        self, name: str, new_name: str, dirs_exist_ok: bool
+        self, name: str, new_name: str, dirs_exist_ok: bool, hardlink: bool = False
     ) -> None:
-        """Copies the directory for the given project."""
+        """Copies the directory for the given project.
+        If ``hardlink``, files are hard linked instead of copied."""
         new_data_path = self.get_project_data_directory(new_name)
         new_logs_path = self.get_project_logs_directory(new_name)
         shutil.copytree(
             self.get_project_data_directory(name),
             new_data_path,
+            copy_function=_FileLinker() if hardlink else _FileCloner(),
             dirs_exist_ok=dirs_exist_ok,
         )
         shutil.copytree(
             self.get_project_logs_directory(name),
             new_logs_path,
+            copy_function=_FileLinker() if hardlink else _FileCloner(),
             dirs_exist_ok=dirs_exist_ok,
         )
         return new_data_path, new_logs_path
@@ -1 +1,21 @@
 """Fixtures for bw_projects"""
+from typing import Tuple
+
+import pytest
+
+from bw_projects.core import ProjectsManager
+
+
+@pytest.fixture(name="base_dirs")
+def _base_dirs(tmpdir) -> Tuple[str, str]:
+    """Returns a dictionary with base directories."""
+    return (
+        tmpdir.mkdir("data"),
+        tmpdir.mkdir("logs"),
+    )
+
+
+@pytest.fixture(name="projects_manager")
+def _projects_manager(base_dirs) -> ProjectsManager:
+    """Returns a ProjectsManager instance."""
+    return ProjectsManager(base_dirs[0], base_dirs[1])
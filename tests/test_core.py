@@ -1,28 +1,75 @@
 """Test cases for the __core__ module."""
+import errno
+import os
+import shutil
+from functools import partial
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List
 
 import pytest
 from peewee import DoesNotExist
 
+from bw_projects.config import Configuration
 from bw_projects.core import ProjectsManager
 from bw_projects.errors import ProjectExistsError
 from bw_projects.helpers import DatabaseHelper
+from bw_projects.model import SQLITE_DATABASE
 
 
-@pytest.fixture(name="base_dirs")
-def _base_dirs(tmpdir) -> Tuple[str, str]:
-    """Returns a dictionary with base directories."""
-    return (
-        tmpdir.mkdir("data"),
-        tmpdir.mkdir("logs"),
+def callback_activate_project(
+    records: List[str],
+    manager: ProjectsManager,
+    name: str,
+    attributes: Dict[str, str],
+    dir_path: str,
+) -> None:
+    """Records the activate project callback arguments."""
+    records.append(
+        f"Manager with {len(manager)} projects activated project {name} "
+        f"with {attributes} and {dir_path}."
     )
 
 
-@pytest.fixture(name="projects_manager")
-def _projects_manager(base_dirs) -> ProjectsManager:
-    """Returns a ProjectsManager instance."""
-    return ProjectsManager(base_dirs[0], base_dirs[1])
+def callback_create_project(
+    records: List[str],
+    manager: ProjectsManager,
+    name: str,
+    attributes: Dict[str, str],
+    dir_path: str,
+) -> None:
+    """Records the create project callback arguments."""
+    records.append(
+        f"Manager with {len(manager)} projects created project {name} "
+        f"with {attributes} and {dir_path}."
+    )
+
+
+def callback_delete_project(
+    records: List[str],
+    manager: ProjectsManager,
+    name: str,
+    attributes: Dict[str, str],
+    dir_path: str,
+) -> None:
+    """Records the delete project callback arguments."""
+    records.append(
+        f"Manager with {len(manager)} projects deleted project {name} "
+        f"with {attributes} and {dir_path}."
+    )
+
+
+def callback_copy_project(
+    records: List[str],
+    manager: ProjectsManager,
+    name: str,
+    attributes: Dict[str, str],
+    dir_path: str,
+) -> None:
+    """Records the copy project callback arguments."""
+    records.append(
+        f"Manager with {len(manager)} projects copied project {name} "
+        f"with {attributes} and {dir_path}."
+    )
 
 
 def test_itr_projects(projects_manager: ProjectsManager) -> None:
@@ -35,6 +82,16 @@ def test_itr_projects(projects_manager: ProjectsManager) -> None:
     assert [project.name for project in projects_manager] == projects
 
 
+def test_iter_names(projects_manager: ProjectsManager) -> None:
+    """Tests iterating over project names."""
+    assert not list(projects_manager.iter_names())  # No projects created yet.
+
+    projects = ["foo", "bar", "baz"]
+    for project in projects:
+        projects_manager.create_project(project)
+    assert sorted(projects_manager.iter_names()) == sorted(projects)
+
+
 def test_contains_project(projects_manager: ProjectsManager) -> None:
     """Tests if projects_manager contains a project."""
     assert "foo" not in projects_manager  # No projects created yet.
@@ -43,6 +100,27 @@ def test_contains_project(projects_manager: ProjectsManager) -> None:
     assert "foo" in projects_manager
 
 
+def test_len(projects_manager: ProjectsManager) -> None:
+    """Tests the number of projects follows creation, copying and deletion."""
+    assert len(projects_manager) == 0  # No projects created yet.
+
+    projects_manager.create_project("foo", activate=True)
+    assert len(projects_manager) == 1
+    projects_manager.copy_project("bar")
+    assert len(projects_manager) == 2
+    projects_manager.delete_project("foo")
+    assert len(projects_manager) == 1
+
+
+def test_len_shared_database(base_dirs) -> None:
+    """Tests the number of projects follows changes made by another manager."""
+    projects_manager = ProjectsManager(base_dirs[0], base_dirs[1])
+    assert len(projects_manager) == 0  # No projects created yet.
+
+    ProjectsManager(base_dirs[0], base_dirs[1]).create_project("foo")
+    assert len(projects_manager) == 1
+
+
 def test_repr(projects_manager: ProjectsManager) -> None:
     """Tests representation of projects_manager."""
     assert (
@@ -74,6 +152,16 @@ def test_base_dirs(base_dirs) -> None:
     assert projects_manager.output_dir == Path.home()
 
 
+def test_sqlite_pragmas(base_dirs) -> None:
+    """Tests SQLite pragmas from configuration are applied."""
+    ProjectsManager(base_dirs[0], base_dirs[1])
+    assert SQLITE_DATABASE.execute_sql("PRAGMA journal_mode").fetchone() == ("wal",)
+
+    config = Configuration(sqlite_pragmas={"journal_mode": "delete"})
+    ProjectsManager(base_dirs[0], base_dirs[1], config=config)
+    assert SQLITE_DATABASE.execute_sql("PRAGMA journal_mode").fetchone() == ("delete",)
+
+
 def test_activate_project_does_not_exist(projects_manager: ProjectsManager) -> None:
     """Tests activating non-existent project."""
     with pytest.raises(DoesNotExist):
@@ -90,25 +178,8 @@ def test_create_project_not_existing_no_activate(
     assert projects_manager.active_project is None
 
 
-def test_create_project_not_existing_activate_with_callbacks(base_dirs, capsys) -> None:
+def test_create_project_not_existing_activate_with_callbacks(base_dirs) -> None:
     """Tests creating non-existent project with activating and callbacks."""
-
-    def callback_activate_project(
-        manager: ProjectsManager, name: str, attributes: Dict[str, str], dir_path: str
-    ):
-        print(
-            f"Manager with {len(manager)} projects activated project {name} "
-            f"with {attributes} and {dir_path}."
-        )
-
-    def callback_create_project(
-        manager: ProjectsManager, name: str, attributes: Dict[str, str], dir_path: str
-    ):
-        print(
-            f"Manager with {len(manager)} projects created project {name} "
-            f"with {attributes} and {dir_path}."
-        )
-
     data_dir = base_dirs[0]
     logs_dir = base_dirs[1]
     project_name = "foo"
@@ -122,11 +193,12 @@ def test_create_project_not_existing_activate_with_callbacks(base_dirs, capsys)
         f"Manager with 1 projects created project foo with {project_attributes} "
         f"and {dir_path}."
     )
+    records: List[str] = []
     projects_manager = ProjectsManager(
         data_dir,
         logs_dir,
-        callbacks_activate_project=[callback_activate_project],
-        callbacks_create_project=[callback_create_project],
+        callbacks_activate_project=[partial(callback_activate_project, records)],
+        callbacks_create_project=[partial(callback_create_project, records)],
     )
     clean_project_name = projects_manager.get_clean_directory_name(project_name)
     projects_manager.create_project(
@@ -137,11 +209,10 @@ def test_create_project_not_existing_activate_with_callbacks(base_dirs, capsys)
     assert projects_manager.active_project.attributes == project_attributes
     assert projects_manager.active_project.dir_data == data_dir / clean_project_name
     assert projects_manager.active_project.dir_logs == logs_dir / clean_project_name
-    assert data_dir.join(project_name).check(dir=True)
-    assert logs_dir.join(project_name).check(dir=True)
+    assert os.path.isdir(os.path.join(str(data_dir), project_name))
+    assert os.path.isdir(os.path.join(str(logs_dir), project_name))
 
-    out, _ = capsys.readouterr()
-    assert out == f"{callback_activate_project_out}\n{callback_create_project_out}\n"
+    assert records == [callback_activate_project_out, callback_create_project_out]
 
 
 def test_create_project_existing_not_okay_no_activate(
@@ -189,17 +260,23 @@ def test_delete_project_does_not_exist_not_exist_okay(
     assert not DatabaseHelper.project_exists(project_name)
 
 
-def test_delete_project_existing_and_active_with_callbacks(base_dirs, capsys) -> None:
-    """Tests deleting existent and active project with callbacks."""
+def test_delete_project_existing_no_active(
+    projects_manager: ProjectsManager,
+) -> None:
+    """Tests deleting existent project while no project is active."""
+    project_name = "foo"
+    projects_manager.create_project(project_name)
+    projects_manager.delete_project(project_name)
+    assert not DatabaseHelper.project_exists(project_name)
+    assert projects_manager.active_project is None
 
-    def callback_delete_project(
-        manager: ProjectsManager, name: str, attributes: Dict[str, str], dir_path: str
-    ):
-        print(
-            f"Manager with {len(manager)} projects deleted project {name} "
-            f"with {attributes} and {dir_path}."
-        )
 
+@pytest.mark.parametrize("delete_dir", [True, False])
+def test_delete_project_existing_and_active_with_callbacks(
+    base_dirs, delete_dir: bool
+) -> None:
+    """Tests deleting existent and active project with callbacks, with and
+    without deleting its directories."""
     data_dir = base_dirs[0]
     logs_dir = base_dirs[1]
     project_name = "foo"
@@ -207,47 +284,44 @@ def test_delete_project_existing_and_active_with_callbacks(base_dirs, capsys) ->
     callback_delete_project_out = (
         f"Manager with 0 projects deleted project foo with {{}} and {dir_path}."
     )
+    records: List[str] = []
     projects_manager = ProjectsManager(
-        data_dir, logs_dir, callbacks_delete_project=[callback_delete_project]
+        data_dir,
+        logs_dir,
+        callbacks_delete_project=[partial(callback_delete_project, records)],
     )
     projects_manager.create_project(project_name, activate=True)
-    projects_manager.delete_project(project_name)
+    projects_manager.delete_project(project_name, delete_dir=delete_dir)
     assert not DatabaseHelper.project_exists(project_name)
     assert projects_manager.active_project is None
-    assert data_dir.join(project_name).check(dir=False)
-    assert logs_dir.join(project_name).check(dir=False)
+    assert projects_manager.data_dir is None
+    assert projects_manager.logs_dir is None
+    assert os.path.isdir(os.path.join(str(data_dir), project_name)) is not delete_dir
+    assert os.path.isdir(os.path.join(str(logs_dir), project_name)) is not delete_dir
 
-    out, _ = capsys.readouterr()
-    assert out == f"{callback_delete_project_out}\n"
+    assert records == [callback_delete_project_out]
 
 
-def test_delete_project_existing_and_active_without_deleting(base_dirs) -> None:
-    """Tests deleting existent and active project with no directory deleting."""
+@pytest.mark.parametrize("missing_dir", [0, 1], ids=["data", "logs"])
+def test_delete_project_rolls_back_on_directory_error(
+    base_dirs, missing_dir: int
+) -> None:
+    """Tests deleting a project keeps it and its files if a directory is gone."""
     project_name = "foo"
-    data_dir = base_dirs[0]
-    logs_dir = base_dirs[1]
-    projects_manager = ProjectsManager(data_dir, logs_dir)
-    projects_manager.create_project(project_name, activate=True)
-    projects_manager.delete_project(project_name, delete_dir=False)
-    assert not DatabaseHelper.project_exists(project_name)
-    assert projects_manager.active_project is None
-    assert data_dir.join(project_name).check(dir=True)
-    assert logs_dir.join(project_name).check(dir=True)
+    projects_manager = ProjectsManager(base_dirs[0], base_dirs[1])
+    projects_manager.create_project(project_name)
+    base_dirs[missing_dir].join(project_name).remove()
+    with pytest.raises(FileNotFoundError):
+        projects_manager.delete_project(project_name)
+    assert DatabaseHelper.project_exists(project_name)
+    kept_dir = os.path.join(str(base_dirs[1 - missing_dir]), project_name)
+    assert os.path.isdir(kept_dir)
 
 
 def test_copy_project_not_existing_dirs_exist_ok_and_switch_with_callbacks(
-    base_dirs, capsys
+    base_dirs,
 ) -> None:
     """Tests copying existent and active project with callbacks."""
-
-    def callback_copy_project(
-        manager: ProjectsManager, name: str, attributes: Dict[str, str], dir_path: str
-    ):
-        print(
-            f"Manager with {len(manager)} projects copied project {name} "
-            f"with {attributes} and {dir_path}."
-        )
-
     data_dir = base_dirs[0]
     logs_dir = base_dirs[1]
     project_name = "foo"
@@ -258,8 +332,11 @@ def test_copy_project_not_existing_dirs_exist_ok_and_switch_with_callbacks(
         f"Manager with 2 projects copied project {new_project_name} with "
         f"{project_attributes} and {new_dir_path}."
     )
+    records: List[str] = []
     projects_manager = ProjectsManager(
-        data_dir, logs_dir, callbacks_copy_project=[callback_copy_project]
+        data_dir,
+        logs_dir,
+        callbacks_copy_project=[partial(callback_copy_project, records)],
     )
     projects_manager.create_project(
         project_name, attributes=project_attributes, activate=True
@@ -271,13 +348,12 @@ def test_copy_project_not_existing_dirs_exist_ok_and_switch_with_callbacks(
     assert projects_manager.active_project.attributes == project_attributes
     assert projects_manager.active_project.dir_data == new_dir_path
     assert projects_manager.active_project.dir_logs == logs_dir / new_project_name
-    assert data_dir.join(project_name).check(dir=True)
-    assert data_dir.join(new_project_name).check(dir=True)
-    assert logs_dir.join(project_name).check(dir=True)
-    assert logs_dir.join(new_project_name).check(dir=True)
+    assert os.path.isdir(os.path.join(str(data_dir), project_name))
+    assert os.path.isdir(os.path.join(str(data_dir), new_project_name))
+    assert os.path.isdir(os.path.join(str(logs_dir), project_name))
+    assert os.path.isdir(os.path.join(str(logs_dir), new_project_name))
 
-    out, _ = capsys.readouterr()
-    assert out == f"{callback_copy_project_out}\n"
+    assert records == [callback_copy_project_out]
 
 
 def test_copy_project_existing_dirs_exist_ok_and_switch(
@@ -294,6 +370,75 @@ def test_copy_project_existing_dirs_exist_ok_and_switch(
         )
 
 
+def test_copy_project_copies_files(projects_manager: ProjectsManager) -> None:
+    """Tests copying a project copies the files in its directories."""
+    projects_manager.create_project("foo", activate=True)
+    (projects_manager.data_dir / "lci" / "data.txt").write_text("bar")
+    (projects_manager.logs_dir / "log.txt").write_text("baz")
+    projects_manager.copy_project("qux")
+    assert (projects_manager.data_dir / "lci" / "data.txt").read_text() == "bar"
+    assert (projects_manager.logs_dir / "log.txt").read_text() == "baz"
+
+
+def test_copy_project_keeps_linked_destination(
+    projects_manager: ProjectsManager,
+) -> None:
+    """Tests copying onto a destination hard linked to the source keeps its data."""
+    projects_manager.create_project("foo", activate=True)
+    file_path = projects_manager.data_dir / "lci" / "data.txt"
+    file_path.write_text("bar")
+    new_lci_dir = projects_manager.data_dir.parent / "baz" / "lci"
+    os.makedirs(new_lci_dir)
+    os.link(file_path, new_lci_dir / "data.txt")
+    with pytest.raises(shutil.Error):
+        projects_manager.copy_project("baz", dirs_exist_ok=True)
+    assert file_path.read_text() == "bar"
+    assert "baz" not in projects_manager
+
+
+def test_copy_project_hardlink(projects_manager: ProjectsManager) -> None:
+    """Tests copying a project with hard links shares its files."""
+    projects_manager.create_project("foo", activate=True)
+    file_path = projects_manager.data_dir / "lci" / "data.txt"
+    file_path.write_text("bar")
+    projects_manager.copy_project("baz", hardlink=True)
+    new_file_path = projects_manager.data_dir / "lci" / "data.txt"
+    assert new_file_path.read_text() == "bar"
+    assert os.path.samefile(file_path, new_file_path)
+
+
+def test_copy_project_hardlink_existing_file(projects_manager: ProjectsManager) -> None:
+    """Tests copying a project with hard links replaces existing files."""
+    projects_manager.create_project("foo", activate=True)
+    file_path = projects_manager.data_dir / "lci" / "data.txt"
+    file_path.write_text("bar")
+    new_lci_dir = projects_manager.data_dir.parent / "baz" / "lci"
+    os.makedirs(new_lci_dir)
+    (new_lci_dir / "data.txt").write_text("qux")
+    projects_manager.copy_project("baz", dirs_exist_ok=True, hardlink=True)
+    new_file_path = projects_manager.data_dir / "lci" / "data.txt"
+    assert new_file_path.read_text() == "bar"
+    assert os.path.samefile(file_path, new_file_path)
+
+
+def test_copy_project_hardlink_across_devices(
+    projects_manager: ProjectsManager, monkeypatch
+) -> None:
+    """Tests copying a project with hard links copies files it cannot link."""
+
+    def link(src: str, dst: str) -> None:
+        raise OSError(errno.EXDEV, os.strerror(errno.EXDEV), src, dst)
+
+    projects_manager.create_project("foo", activate=True)
+    file_path = projects_manager.data_dir / "lci" / "data.txt"
+    file_path.write_text("bar")
+    monkeypatch.setattr(os, "link", link)
+    projects_manager.copy_project("baz", hardlink=True)
+    new_file_path = projects_manager.data_dir / "lci" / "data.txt"
+    assert new_file_path.read_text() == "bar"
+    assert not os.path.samefile(file_path, new_file_path)
+
+
 def test_request_directory(projects_manager: ProjectsManager) -> None:
     """Tests requesting a directory."""
     dirname = "bar"
@@ -0,0 +1,86 @@
+"""Test cases for the __helpers__ module."""
+import errno
+import os
+import shutil
+
+import pytest
+
+from bw_projects.core import ProjectsManager
+from bw_projects.helpers import FICLONE, DatabaseHelper, _FileCloner, fcntl
+
+requires_fcntl = pytest.mark.skipif(fcntl is None, reason="Cloning is Linux only.")
+
+
+def test_get_project_after_outside_delete(projects_manager: ProjectsManager) -> None:
+    """Tests a project deleted outside of the helpers is no longer returned."""
+    projects_manager.create_project("foo")
+    DatabaseHelper.get_project("foo").delete_instance()
+    assert DatabaseHelper.get_project_or_none("foo") is None
+
+    projects_manager.create_project("foo", exist_ok=True)
+    assert DatabaseHelper.get_project("foo").name == "foo"
+
+
+@requires_fcntl
+def test_file_cloner_clones(tmp_path, monkeypatch) -> None:
+    """Tests a successful clone keeps cloning and copies file metadata."""
+    requests = []
+    monkeypatch.setattr(
+        fcntl, "ioctl", lambda fd, request, arg: requests.append(request)
+    )
+    src = tmp_path / "src"
+    src.write_text("foo")
+    os.utime(src, (0, 0))
+    cloner = _FileCloner()
+    assert cloner(str(src), str(tmp_path / "dst")) == str(tmp_path / "dst")
+    assert requests == [FICLONE]
+    assert cloner.clone_supported
+    assert os.stat(tmp_path / "dst").st_mtime == 0
+
+
+@requires_fcntl
+def test_file_cloner_unsupported(tmp_path, monkeypatch) -> None:
+    """Tests an unsupported clone falls back to copying for the rest of the tree."""
+    requests = []
+
+    def ioctl(fd: int, request: int, arg: int) -> None:
+        requests.append(request)
+        raise OSError(errno.EOPNOTSUPP, os.strerror(errno.EOPNOTSUPP))
+
+    monkeypatch.setattr(fcntl, "ioctl", ioctl)
+    src = tmp_path / "src"
+    src.write_text("foo")
+    cloner = _FileCloner()
+    cloner(str(src), str(tmp_path / "dst"))
+    cloner(str(src), str(tmp_path / "dst2"))
+    assert requests == [FICLONE]
+    assert not cloner.clone_supported
+    assert (tmp_path / "dst").read_text() == "foo"
+    assert (tmp_path / "dst2").read_text() == "foo"
+
+
+@requires_fcntl
+def test_file_cloner_error(tmp_path, monkeypatch) -> None:
+    """Tests other clone errors propagate without leaving a partial file."""
+
+    def ioctl(fd: int, request: int, arg: int) -> None:
+        raise OSError(errno.EIO, os.strerror(errno.EIO))
+
+    monkeypatch.setattr(fcntl, "ioctl", ioctl)
+    src = tmp_path / "src"
+    src.write_text("foo")
+    cloner = _FileCloner()
+    with pytest.raises(OSError) as error:
+        cloner(str(src), str(tmp_path / "dst"))
+    assert error.value.errno == errno.EIO
+    assert cloner.clone_supported
+    assert not (tmp_path / "dst").exists()
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="Needs named pipes.")
+def test_file_cloner_named_pipe(tmp_path) -> None:
+    """Tests a named pipe is refused instead of blocking on open."""
+    os.mkfifo(tmp_path / "src")
+    with pytest.raises(shutil.SpecialFileError):
+        _FileCloner()(str(tmp_path / "src"), str(tmp_path / "dst"))
+    assert not (tmp_path / "dst").exists()